@@ -1,7 +1,17 @@
+import errno
+import hashlib
 import json
 import os
+import pickle
 import re
 
+try:
+    # Python 3
+    from sys import intern
+except (ImportError):
+    # Python 2 can only intern byte strings, but JSON strings are unicode
+    intern = None
+
 try:
     # Python 3
     from urllib.parse import urljoin
@@ -11,14 +21,227 @@ except (ImportError):
     from urlparse import urljoin
     str_cls = unicode  # noqa
 
-from .. import text
+try:
+    # orjson and pysimdjson parse bytes directly and are many times faster
+    # than the json module, so they are used when installed
+    from orjson import loads as _json_loads
+    _fast_json_loads = True
+except (ImportError):
+    try:
+        from simdjson import loads as _json_loads
+        _fast_json_loads = True
+    except (ImportError):
+        _fast_json_loads = False
+
+        def _json_loads(string):
+            return json.loads(string.decode('utf-8'))
+
+# ijson is used to stream channel files from disk when installed, but only
+# with its C backend, since the others are much slower than the json module.
+# It is also slower than orjson and pysimdjson, so is not used with them.
+# Version 3.1 added the use_float parameter of kvitems().
+try:
+    import ijson
+    _ijson_version = tuple(int(part) for part in ijson.__version__.split('.')[:2])
+    if _fast_json_loads or ijson.backend != 'yajl2_c' or _ijson_version < (3, 1):
+        ijson = None
+except (ImportError, AttributeError, ValueError):
+    ijson = None
+
+from .. import __version__, text
 from ..console_write import console_write
 from .provider_exception import ProviderException
 from .schema_compat import platforms_to_releases
 from ..download_manager import downloader, update_url
+from ..http_cache import HttpCache
+from ..unicode import unicode_from_os
 from ..versions import version_sort
 
 
+_http_regex = re.compile('https?://', re.I)
+
+# The version of the channel info stored in the parsed channel cache. This
+# must be incremented whenever the processing done by fetch() changes.
+PARSED_CACHE_FORMAT = 3
+
+# The top-level channel keys that are read by ChannelProvider
+CHANNEL_KEYS = set([
+    'schema_version',
+    'repositories',
+    'packages',
+    'packages_cache',
+    'dependencies_cache',
+    'package_name_map',
+    'renamed_packages'
+])
+
+
+def finalize_packages(packages, schema_major_version, debug):
+    """
+    Converts the cached package info of a repository in a channel into the
+    format returned by ChannelProvider.get_packages(). For schema 2.0 and
+    newer the package dicts are updated in place rather than copied, since
+    they are owned by the ChannelProvider that fetched them.
+
+    :param packages:
+        A list of package info dicts from the channel
+
+    :param schema_major_version:
+        The integer major version of the channel schema
+
+    :param debug:
+        If debugging is enabled
+
+    :return:
+        A dict of package name -> package info dict
+    """
+
+    # In schema version 2.0, we store a list of dicts containing info
+    # about all available releases. These include "version" and
+    # "platforms" keys that are used to pick the download for the
+    # current machine.
+    if schema_major_version >= 2:
+        finalize = _finalize_package
+    else:
+        finalize = _finalize_legacy_package
+
+    output = {}
+    for package in packages:
+        package = finalize(package, debug)
+        output[package['name']] = package
+
+    return output
+
+
+def _finalize_package(package, debug):
+    """
+    Finalizes the info of a package from a schema 2.0 or newer channel
+
+    :param package:
+        The package info dict, which is updated in place
+
+    :param debug:
+        If debugging is enabled
+
+    :return:
+        The package info dict
+    """
+
+    dates = [release['date'] for release in package.get('releases', []) if release.get('date')]
+    package['last_modified'] = max(dates) if dates else None
+
+    return _finalize_common(package)
+
+
+def _finalize_legacy_package(package, debug):
+    """
+    Finalizes the info of a package from a schema 1.x channel, converting
+    the "platforms" key into a sorted list of releases
+
+    :param package:
+        The package info dict
+
+    :param debug:
+        If debugging is enabled
+
+    :return:
+        A new package info dict
+    """
+
+    # The conversion removes the "platforms" key, so it is done on a
+    # copy to leave the channel info usable by later calls
+    package = package.copy()
+    releases = platforms_to_releases(package, debug)
+    package['releases'] = version_sort(releases, 'platforms', reverse=True)
+    del package['platforms']
+
+    return _finalize_common(package)
+
+
+def _finalize_common(package):
+    """
+    Adds the optional fields missing from a package info dict
+
+    :param package:
+        The package info dict, which is updated in place
+
+    :return:
+        The package info dict
+    """
+
+    package.setdefault('buy', None)
+    package.setdefault('issues', None)
+    if 'labels' not in package:
+        package['labels'] = []
+    if 'previous_names' not in package:
+        package['previous_names'] = []
+    package.setdefault('readme', None)
+    package.setdefault('donate', None)
+
+    return package
+
+
+def _prepare_releases(cache):
+    """
+    Sorts the releases of each package or dependency in a channel cache,
+    newest first, and interns the small strings that are repeated across
+    most releases, so a single copy of each is kept in memory
+
+    :param cache:
+        A dict of repository URL -> list of package or dependency info
+        dicts, which are updated in place
+    """
+
+    for infos in cache.values():
+        for info in infos:
+            if intern is not None:
+                for release in info['releases']:
+                    release['platforms'] = [intern(platform) for platform in release['platforms']]
+                    for key in ('sublime_text', 'version'):
+                        if key in release:
+                            release[key] = intern(release[key])
+
+            info['releases'] = version_sort(info['releases'], 'platforms', reverse=True)
+
+
+def _validate_release(release, name, schema_error):
+    """
+    Checks the structure of a release of a schema 2.0+ package or a
+    dependency, as used when sorting releases in fetch(). A "platforms"
+    string is normalized to a list.
+
+    :param release:
+        The release info
+
+    :param name:
+        The name of the package or dependency the release is for
+
+    :param schema_error:
+        The start of the error message for an invalid channel
+
+    :raises:
+        ProviderException: when the release is not structured correctly
+    """
+
+    if not isinstance(release, dict):
+        raise ProviderException(u'%s a release of "%s" is not an object.' % (schema_error, name))
+
+    # A single platform string is accepted, as by RepositoryProvider
+    platforms = release.get('platforms')
+    if isinstance(platforms, str_cls):
+        platforms = release['platforms'] = [platforms]
+    if not isinstance(platforms, list) or not all(isinstance(p, str_cls) for p in platforms):
+        raise ProviderException(
+            u'%s the "platforms" of a release of "%s" is missing or not a list of strings.' % (schema_error, name)
+        )
+
+    for key in ('version', 'sublime_text'):
+        if key in release and not isinstance(release[key], str_cls):
+            raise ProviderException(
+                u'%s the "%s" of a release of "%s" is not a string.' % (schema_error, key, name)
+            )
+
+
 class ChannelProvider():
 
     """
@@ -29,6 +252,11 @@ class ChannelProvider():
     has the side effect of lessening the load on the GitHub and BitBucket APIs
     and getting around not-infrequent HTTP 503 errors from those APIs.
 
+    Once fetched, the channel info is owned by the provider, and the dicts
+    returned by get_packages() and get_dependencies() are the ones stored in
+    it, not copies. Their results are cached per repository, so repeated
+    calls return the same dict.
+
     :param channel:
         The URL of the channel
 
@@ -39,6 +267,9 @@ class ChannelProvider():
           `timeout`,
           `user_agent`
         Optional fields:
+          `cache`,
+          `http_cache`,
+          `http_cache_length`,
           `http_proxy`,
           `https_proxy`,
           `proxy_username`,
@@ -52,6 +283,14 @@ class ChannelProvider():
         self.schema_major_version = 0
         self.channel = channel
         self.settings = settings
+        self.cache = {'get_packages': {}, 'get_dependencies': {}}
+        self.debug = bool(settings.get('debug'))
+        self._updated_urls = {}
+        self._packages_key = 'packages'
+        self._renamed_packages = None
+        self._packages = {}
+        self._dependencies = {}
+        self._http_cache = None
 
     @classmethod
     def match_url(cls, channel):
@@ -82,16 +321,19 @@ class ChannelProvider():
         if self.channel_info is not None:
             return
 
-        if re.match('https?://', self.channel, re.I):
+        if self.channel[:8].lower().startswith(('http://', 'https://')):
             with downloader(self.channel, self.settings) as manager:
                 channel_json = manager.fetch(self.channel, 'Error downloading channel.')
+            validator = hashlib.sha1(channel_json).hexdigest()
 
         # All other channels are expected to be filesystem paths
         else:
-            if not os.path.exists(self.channel):
-                raise ProviderException(u'Error, file %s does not exist' % self.channel)
+            try:
+                stat = os.stat(self.channel)
+            except (OSError) as e:
+                raise self._file_error(e)
 
-            if self.settings.get('debug'):
+            if self.debug:
                 console_write(
                     u'''
                     Loading %s as a channel
@@ -99,17 +341,40 @@ class ChannelProvider():
                     self.channel
                 )
 
-            # We open as binary so we get bytes like the DownloadManager
-            with open(self.channel, 'rb') as f:
-                channel_json = f.read()
+            # The file is only read if the parsed cache is stale. Python 2
+            # does not provide the mtime with nanosecond resolution.
+            channel_json = None
+            mtime = getattr(stat, 'st_mtime_ns', None)
+            if mtime is None:
+                mtime = repr(stat.st_mtime)
+            validator = '%s-%d' % (mtime, stat.st_size)
 
-        try:
-            channel_info = json.loads(channel_json.decode('utf-8'))
-        except (ValueError):
-            raise ProviderException(u'Error parsing JSON from channel %s.' % self.channel)
+        if self._load_parsed_cache(validator):
+            return
+
+        if channel_json is None and ijson is not None:
+            channel_info = self._stream_channel_file()
+
+        else:
+            if channel_json is None:
+                # We open as binary so we get bytes like the DownloadManager
+                try:
+                    with open(self.channel, 'rb') as f:
+                        channel_json = f.read()
+                except (IOError, OSError) as e:
+                    raise self._file_error(e)
+
+            try:
+                channel_info = _json_loads(channel_json)
+            # The decode errors of orjson and pysimdjson are subclasses of ValueError
+            except (ValueError):
+                raise ProviderException(u'Error parsing JSON from channel %s.' % self.channel)
 
         schema_error = u'Channel %s does not appear to be a valid channel file because ' % self.channel
 
+        if not isinstance(channel_info, dict):
+            raise ProviderException(u'%s the JSON is not an object.' % schema_error)
+
         if 'schema_version' not in channel_info:
             raise ProviderException(u'%s the "schema_version" JSON key is missing.' % schema_error)
 
@@ -131,19 +396,315 @@ class ChannelProvider():
             ))
 
         version_parts = self.schema_version.split('.')
-        self.schema_major_version = int(version_parts[0])
+        self._set_schema_major_version(int(version_parts[0]))
+
+        self._validate_channel(channel_info, schema_error)
 
         # Fix any out-dated repository URLs in the package cache
-        debug = self.settings.get('debug')
-        packages_key = 'packages_cache' if self.schema_major_version >= 2 else 'packages'
-        if packages_key in channel_info:
-            original_cache = channel_info[packages_key]
-            new_cache = {}
-            for repo in original_cache:
-                new_cache[update_url(repo, debug)] = original_cache[repo]
-            channel_info[packages_key] = new_cache
+        if self._packages_key in channel_info:
+            packages_cache = channel_info[self._packages_key]
+            # Most URLs are current, so only the changed keys are moved
+            changed = []
+            for repo in packages_cache:
+                updated_repo = self._update_url(repo)
+                if updated_repo != repo:
+                    changed.append((repo, updated_repo))
+            for repo, updated_repo in changed:
+                packages_cache[updated_repo] = packages_cache.pop(repo)
+
+        self._set_channel_info(channel_info)
+
+        # Releases are sorted once here instead of by every get_*() call,
+        # which also stores them sorted in the parsed channel cache. Pickle
+        # keeps the interned strings shared when the cache is loaded. Schema
+        # 1.x packages do not have releases until get_packages() converts them.
+        if self.schema_major_version >= 2:
+            _prepare_releases(self._packages)
+        _prepare_releases(self._dependencies)
+
+        self._save_parsed_cache(validator)
+
+    def _validate_channel(self, channel_info, schema_error):
+        """
+        Checks the structure of the channel info once, when it is parsed, so
+        that fetch() and the get_*() methods can use it without defensive
+        checks. The "previous_names" of packages are normalized to lists
+        along the way.
+
+        :param channel_info:
+            The dict of channel info
+
+        :param schema_error:
+            The start of the error message for an invalid channel
+
+        :raises:
+            ProviderException: when the channel info is not structured correctly
+        """
+
+        def is_str_list(value):
+            return isinstance(value, list) and all(isinstance(item, str_cls) for item in value)
+
+        def invalid(message, params):
+            return ProviderException(u'%s %s' % (schema_error, message % params))
+
+        if not is_str_list(channel_info.get('repositories')):
+            raise invalid(u'the "repositories" JSON key is missing or not a list of strings.', ())
+
+        for key in ('package_name_map', 'renamed_packages'):
+            if not isinstance(channel_info.get(key, {}), dict):
+                raise invalid(u'the "%s" JSON key is not an object.', key)
+
+        for key in (self._packages_key, 'dependencies_cache'):
+            cache = channel_info.get(key, {})
+            if not isinstance(cache, dict):
+                raise invalid(u'the "%s" JSON key is not an object.', key)
+
+            # Schema 1.x packages list their releases per platform, and are
+            # converted to releases by get_packages()
+            has_releases = key == 'dependencies_cache' or self.schema_major_version >= 2
+
+            for infos in cache.values():
+                if not isinstance(infos, list):
+                    raise invalid(u'a value in the "%s" JSON object is not a list.', key)
+
+                for info in infos:
+                    if not isinstance(info, dict) or not isinstance(info.get('name'), str_cls):
+                        raise invalid(u'an entry in the "%s" JSON object is not an object with a "name" string.', key)
+
+                    name = info['name']
+
+                    previous_names = info.get('previous_names')
+                    if previous_names is None:
+                        if 'previous_names' in info:
+                            info['previous_names'] = []
+                    elif isinstance(previous_names, str_cls):
+                        info['previous_names'] = [previous_names]
+                    elif not is_str_list(previous_names):
+                        raise invalid(u'the "previous_names" of "%s" is not a string or list of strings.', name)
+
+                    if has_releases:
+                        releases = info.get('releases')
+                        if not isinstance(releases, list):
+                            raise invalid(u'the "releases" of "%s" is missing or not a list.', name)
+                        for release in releases:
+                            _validate_release(release, name, schema_error)
+                        continue
+
+                    platforms = info.get('platforms')
+                    if not isinstance(platforms, dict):
+                        raise invalid(u'the "platforms" of "%s" is missing or not an object.', name)
+                    for platform_releases in platforms.values():
+                        if not isinstance(platform_releases, list):
+                            raise invalid(u'a value in the "platforms" of "%s" is not a list.', name)
+                        for release in platform_releases:
+                            if not isinstance(release, dict) \
+                                    or not isinstance(release.get('version'), str_cls) \
+                                    or not isinstance(release.get('url'), str_cls):
+                                raise invalid(
+                                    u'a release of "%s" is not an object with "version" and "url" strings.',
+                                    name
+                                )
+
+    def _set_schema_major_version(self, schema_major_version):
+        """
+        Sets the schema major version, along with the keys that depend on it
+
+        :param schema_major_version:
+            The integer major version of the channel schema
+        """
+
+        self.schema_major_version = schema_major_version
+
+        # The 2.0 channel schema renamed the key cached package info was
+        # stored under in order to be more clear to new users.
+        self._packages_key = 'packages_cache' if schema_major_version >= 2 else 'packages'
+
+    def _set_channel_info(self, channel_info):
+        """
+        Sets the channel info, along with direct references to the dicts of
+        cached package and dependency info, keyed by repository URL
+
+        :param channel_info:
+            The dict of channel info
+        """
 
         self.channel_info = channel_info
+        self._packages = channel_info.get(self._packages_key) or {}
+        self._dependencies = channel_info.get('dependencies_cache') or {}
+
+    def _update_url(self, url):
+        """
+        A memoized version of update_url(), since the same repository URLs
+        are updated by fetch() and then by every call to the get_*() methods
+
+        :param url:
+            The URL to update
+
+        :return:
+            The updated URL
+        """
+
+        updated_url = self._updated_urls.get(url)
+        if updated_url is None:
+            updated_url = update_url(url, self.debug)
+            self._updated_urls[url] = updated_url
+        return updated_url
+
+    def _stream_channel_file(self):
+        """
+        Parses a channel file incrementally with ijson, keeping only the
+        top-level keys used by this provider. Unlike reading the file and
+        then parsing it, the raw JSON is never held in memory.
+
+        :raises:
+            ProviderException: when the file does not contain valid JSON
+
+        :return:
+            A dict of the channel info
+        """
+
+        channel_info = {}
+        try:
+            with open(self.channel, 'rb') as f:
+                for key, value in ijson.kvitems(f, '', use_float=True):
+                    if key in CHANNEL_KEYS:
+                        channel_info[key] = value
+        except (IOError, OSError) as e:
+            raise self._file_error(e)
+        except (ijson.JSONError, ValueError):
+            raise ProviderException(u'Error parsing JSON from channel %s.' % self.channel)
+
+        return channel_info
+
+    def _file_error(self, e):
+        """
+        Converts an error accessing a channel file into a ProviderException,
+        so that a single bad channel path does not abort listing the others
+
+        :param e:
+            The IOError or OSError that was raised
+
+        :return:
+            A ProviderException to raise
+        """
+
+        if e.errno == errno.ENOENT:
+            return ProviderException(u'Error, file %s does not exist' % self.channel)
+        return ProviderException(
+            u'Error reading channel file %s - %s' % (self.channel, unicode_from_os(e.strerror or e))
+        )
+
+    def _get_http_cache(self):
+        """
+        Returns the HTTP cache the parsed channel is stored in. This is the
+        `cache` object from the settings, if one was provided, otherwise one
+        is created the same way DownloadManager does when the `http_cache`
+        setting is enabled.
+
+        :return:
+            An HttpCache object, or False if there is no cache
+        """
+
+        if self._http_cache is None:
+            self._http_cache = self.settings.get('cache') or False
+            if not self._http_cache and self.settings.get('http_cache'):
+                cache_length = self.settings.get('http_cache_length', 604800)
+                self._http_cache = HttpCache(cache_length)
+        return self._http_cache
+
+    def _parsed_cache_key(self, suffix=''):
+        """
+        Generates the key the parsed channel is stored under in the HTTP cache
+
+        :param suffix:
+            A string to append to the key
+
+        :return:
+            A string key for the channel
+        """
+
+        channel = self.channel
+        if isinstance(channel, str_cls):
+            channel = channel.encode('utf-8')
+
+        return 'channel_' + hashlib.sha1(channel).hexdigest() + suffix
+
+    def _load_parsed_cache(self, validator):
+        """
+        Loads a previously parsed and post-processed copy of the channel, if
+        one was cached for the current version of the channel contents
+
+        :param validator:
+            A string that changes whenever the channel contents change - the
+            SHA1 of the downloaded content, or the mtime and size of a file
+
+        :return:
+            A bool - if the channel info was loaded from the cache
+        """
+
+        cache = self._get_http_cache()
+        if not cache:
+            return False
+
+        info_key = self._parsed_cache_key('.info')
+        key = self._parsed_cache_key('.pickle')
+        if not cache.has(info_key) or not cache.has(key):
+            return False
+
+        try:
+            with open(cache.path(info_key), 'rb') as f:
+                info = json.loads(f.read().decode('utf-8'))
+            if info.get('format') != PARSED_CACHE_FORMAT \
+                    or info.get('version') != __version__ \
+                    or info.get('validator') != validator:
+                return False
+
+            with open(cache.path(key), 'rb') as f:
+                struct = pickle.load(f)
+            if struct[0] != validator:
+                return False
+            schema_version, schema_major_version, channel_info = struct[1:]
+
+        # A cache entry from another Python version, or one that was only
+        # partially written, is treated the same as a missing entry
+        except (Exception):
+            return False
+
+        if self.debug:
+            console_write(
+                u'''
+                Using parsed channel %s from %s
+                ''',
+                (self.channel, cache.path(key))
+            )
+
+        self.schema_version = schema_version
+        self._set_schema_major_version(schema_major_version)
+        self._set_channel_info(channel_info)
+        return True
+
+    def _save_parsed_cache(self, validator):
+        """
+        Stores the parsed and post-processed channel info so that future
+        loads of an unchanged channel skip the JSON parsing
+
+        :param validator:
+            A string that changes whenever the channel contents change
+        """
+
+        cache = self._get_http_cache()
+        if not cache:
+            return
+
+        struct = (validator, self.schema_version, self.schema_major_version, self.channel_info)
+        info_json = json.dumps({
+            'format': PARSED_CACHE_FORMAT,
+            'version': __version__,
+            'validator': validator
+        }, indent=4)
+
+        cache.set(self._parsed_cache_key('.pickle'), pickle.dumps(struct, pickle.HIGHEST_PROTOCOL))
+        cache.set(self._parsed_cache_key('.info'), info_json.encode('utf-8'))
 
     def get_name_map(self):
         """
@@ -174,19 +735,21 @@ class ChannelProvider():
 
         self.fetch()
 
+        # The channel info does not change after it is fetched
+        if self._renamed_packages is not None:
+            return self._renamed_packages
+
         if self.schema_major_version >= 2:
             output = {}
-            if 'packages_cache' in self.channel_info:
-                for repo in self.channel_info['packages_cache']:
-                    for package in self.channel_info['packages_cache'][repo]:
-                        previous_names = package.get('previous_names', [])
-                        if not isinstance(previous_names, list):
-                            previous_names = [previous_names]
-                        for previous_name in previous_names:
-                            output[previous_name] = package['name']
-            return output
-
-        return self.channel_info.get('renamed_packages', {})
+            for packages in self._packages.values():
+                for package in packages:
+                    for previous_name in package.get('previous_names', ()):
+                        output[previous_name] = package['name']
+        else:
+            output = self.channel_info.get('renamed_packages', {})
+
+        self._renamed_packages = output
+        return output
 
     def get_repositories(self):
         """
@@ -200,34 +763,23 @@ class ChannelProvider():
 
         self.fetch()
 
-        if 'repositories' not in self.channel_info:
-            raise ProviderException(text.format(
-                u'''
-                Channel %s does not appear to be a valid channel file because
-                the "repositories" JSON key is missing.
-                ''',
-                self.channel
-            ))
-
         # Determine a relative root so repositories can be defined
         # relative to the location of the channel file.
-        if re.match('https?://', self.channel, re.I) is None:
+        if _http_regex.match(self.channel) is None:
             relative_base = os.path.dirname(self.channel)
             is_http = False
         else:
             is_http = True
 
-        debug = self.settings.get('debug')
         output = []
-        repositories = self.channel_info.get('repositories', [])
-        for repository in repositories:
-            if re.match(r'^\./|\.\./', repository):
+        for repository in self.channel_info['repositories']:
+            if repository.startswith(('./', '../')):
                 if is_http:
                     repository = urljoin(self.channel, repository)
                 else:
                     repository = os.path.join(relative_base, repository)
                     repository = os.path.normpath(repository)
-            output.append(update_url(repository, debug))
+            output.append(self._update_url(repository))
 
         return output
 
@@ -284,53 +836,19 @@ class ChannelProvider():
 
         self.fetch()
 
-        repo = update_url(repo, self.settings.get('debug'))
-
-        # The 2.0 channel schema renamed the key cached package info was
-        # stored under in order to be more clear to new users.
-        packages_key = 'packages_cache' if self.schema_major_version >= 2 else 'packages'
-
-        if self.channel_info.get(packages_key, False) is False:
-            return {}
+        repo = self._update_url(repo)
 
-        if self.channel_info[packages_key].get(repo, False) is False:
-            return {}
+        # The channel info does not change after it is fetched
+        if repo in self.cache['get_packages']:
+            return self.cache['get_packages'][repo]
 
-        output = {}
-        for package in self.channel_info[packages_key][repo]:
-            copy = package.copy()
-
-            # In schema version 2.0, we store a list of dicts containing info
-            # about all available releases. These include "version" and
-            # "platforms" keys that are used to pick the download for the
-            # current machine.
-            if self.schema_major_version < 2:
-                copy['releases'] = platforms_to_releases(copy, self.settings.get('debug'))
-                del copy['platforms']
-            else:
-                last_modified = None
-                for release in copy.get('releases', []):
-                    date = release.get('date')
-                    if not last_modified or (date and date > last_modified):
-                        last_modified = date
-                copy['last_modified'] = last_modified
-
-            defaults = {
-                'buy': None,
-                'issues': None,
-                'labels': [],
-                'previous_names': [],
-                'readme': None,
-                'donate': None
-            }
-            for field in defaults:
-                if field not in copy:
-                    copy[field] = defaults[field]
-
-            copy['releases'] = version_sort(copy['releases'], 'platforms', reverse=True)
-
-            output[copy['name']] = copy
+        output = finalize_packages(
+            self._packages.get(repo, ()),
+            self.schema_major_version,
+            self.debug
+        )
 
+        self.cache['get_packages'][repo] = output
         return output
 
     def get_dependencies(self, repo):
@@ -370,17 +888,14 @@ class ChannelProvider():
 
         self.fetch()
 
-        repo = update_url(repo, self.settings.get('debug'))
+        repo = self._update_url(repo)
 
-        if self.channel_info.get('dependencies_cache', False) is False:
-            return {}
-
-        if self.channel_info['dependencies_cache'].get(repo, False) is False:
-            return {}
+        if repo in self.cache['get_dependencies']:
+            return self.cache['get_dependencies'][repo]
 
         output = {}
-        for dependency in self.channel_info['dependencies_cache'][repo]:
-            dependency['releases'] = version_sort(dependency['releases'], 'platforms', reverse=True)
+        for dependency in self._dependencies.get(repo, ()):
             output[dependency['name']] = dependency
 
+        self.cache['get_dependencies'][repo] = output
         return output
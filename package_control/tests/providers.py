@@ -1,5 +1,11 @@
+import json
+import os
+import shutil
+import tempfile
 import unittest
 
+from ..providers import channel_provider
+from ..providers.provider_exception import ProviderException
 from ..providers.repository_provider import RepositoryProvider
 from ..providers.channel_provider import ChannelProvider
 from ..providers.github_repository_provider import GitHubRepositoryProvider
@@ -2031,3 +2037,184 @@ class ChannelProviderTests(unittest.TestCase):
                 "https://raw.githubusercontent.com/wbond/package_control-json/master/repository-3.0.0-explicit.json"
             )
         )
+
+    def channel_path(self):
+        """
+        Creates a temporary channel file path, removing it and its parsed
+        channel cache entries once the test is complete
+        """
+
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+
+        path = os.path.join(temp_dir, 'channel.json')
+
+        def remove_parsed_cache():
+            provider = ChannelProvider(path, self.settings())
+            cache = provider.settings['cache']
+            for suffix in ('.info', '.pickle'):
+                key = provider._parsed_cache_key(suffix)
+                if cache.has(key):
+                    os.unlink(cache.path(key))
+
+        self.addCleanup(remove_parsed_cache)
+        return path
+
+    def write_channel(self, path, channel_info, mtime=1500000000):
+        """
+        Writes a channel file with a fixed mtime, so that rewriting it with
+        contents of the same size is invisible to the parsed channel cache
+        """
+
+        with open(path, 'wb') as f:
+            f.write(json.dumps(channel_info).encode('utf-8'))
+        os.utime(path, (mtime, mtime))
+
+    def cache_channel(self, description):
+        return {
+            'schema_version': '3.0.0',
+            'repositories': ['https://example.com/repository.json'],
+            'packages_cache': {
+                'https://example.com/repository.json': [
+                    {
+                        'name': 'Example',
+                        'description': description,
+                        'releases': [
+                            {
+                                'version': '1.0.0',
+                                'date': '2015-01-01 00:00:00',
+                                'url': 'https://example.com/example.zip',
+                                'sublime_text': '*',
+                                'platforms': ['*']
+                            }
+                        ]
+                    }
+                ]
+            }
+        }
+
+    def cached_description(self, path):
+        provider = ChannelProvider(path, self.settings())
+        packages = provider.get_packages('https://example.com/repository.json')
+        return packages['Example']['description']
+
+    def test_parsed_cache_hit(self):
+        path = self.channel_path()
+        self.write_channel(path, self.cache_channel('aaa'))
+        self.assertEqual('aaa', self.cached_description(path))
+
+        # The same size and mtime, so the pickled channel info is used
+        self.write_channel(path, self.cache_channel('bbb'))
+        self.assertEqual('aaa', self.cached_description(path))
+
+    def test_parsed_cache_validator_change(self):
+        path = self.channel_path()
+        self.write_channel(path, self.cache_channel('aaa'))
+        self.assertEqual('aaa', self.cached_description(path))
+
+        self.write_channel(path, self.cache_channel('bbb'), mtime=1500000010)
+        self.assertEqual('bbb', self.cached_description(path))
+
+    def test_parsed_cache_format_change(self):
+        path = self.channel_path()
+        self.write_channel(path, self.cache_channel('aaa'))
+        self.assertEqual('aaa', self.cached_description(path))
+
+        self.write_channel(path, self.cache_channel('bbb'))
+        original_format = channel_provider.PARSED_CACHE_FORMAT
+        channel_provider.PARSED_CACHE_FORMAT += 1
+        try:
+            self.assertEqual('bbb', self.cached_description(path))
+        finally:
+            channel_provider.PARSED_CACHE_FORMAT = original_format
+
+    def test_parsed_cache_version_change(self):
+        path = self.channel_path()
+        self.write_channel(path, self.cache_channel('aaa'))
+        self.assertEqual('aaa', self.cached_description(path))
+
+        self.write_channel(path, self.cache_channel('bbb'))
+        original_version = channel_provider.__version__
+        channel_provider.__version__ += '-next'
+        try:
+            self.assertEqual('bbb', self.cached_description(path))
+        finally:
+            channel_provider.__version__ = original_version
+
+    def test_parsed_cache_corrupt(self):
+        path = self.channel_path()
+        self.write_channel(path, self.cache_channel('aaa'))
+        self.assertEqual('aaa', self.cached_description(path))
+
+        provider = ChannelProvider(path, self.settings())
+        cache = provider.settings['cache']
+        with open(cache.path(provider._parsed_cache_key('.pickle')), 'wb') as f:
+            f.write(b'not a pickle')
+
+        self.write_channel(path, self.cache_channel('bbb'))
+        self.assertEqual('bbb', self.cached_description(path))
+
+    def test_previous_names_normalized(self):
+        path = self.channel_path()
+        channel_info = self.cache_channel('aaa')
+        packages = channel_info['packages_cache']['https://example.com/repository.json']
+        packages[0]['previous_names'] = None
+        packages.append(dict(packages[0], name='Renamed', previous_names='Old Name'))
+        self.write_channel(path, channel_info)
+
+        provider = ChannelProvider(path, {'debug': False})
+        self.assertEqual({'Old Name': 'Renamed'}, provider.get_renamed_packages())
+        packages = provider.get_packages('https://example.com/repository.json')
+        self.assertEqual([], packages['Example']['previous_names'])
+        self.assertEqual(['Old Name'], packages['Renamed']['previous_names'])
+
+    def test_file_error_missing(self):
+        provider = ChannelProvider(self.channel_path(), {'debug': False})
+        with self.assertRaises(ProviderException) as cm:
+            provider.fetch()
+        self.assertIn(u'does not exist', cm.exception.args[0])
+
+    def test_file_error_unreadable(self):
+        path = self.channel_path()
+        self.write_channel(path, self.cache_channel('aaa'))
+
+        # A directory and a path below a regular file
+        for bad_path in [os.path.dirname(path), os.path.join(path, 'channel.json')]:
+            provider = ChannelProvider(bad_path, {'debug': False})
+            with self.assertRaises(ProviderException) as cm:
+                provider.fetch()
+            self.assertIn(u'Error reading channel file %s - ' % bad_path, cm.exception.args[0])
+
+    def test_invalid_channel_structure(self):
+        def package_channel(**fields):
+            channel_info = self.cache_channel('aaa')
+            channel_info['packages_cache']['https://example.com/repository.json'][0].update(fields)
+            return channel_info
+
+        def release_channel(**fields):
+            release = dict(self.cache_channel('aaa')['packages_cache'][
+                'https://example.com/repository.json'][0]['releases'][0], **fields)
+            return package_channel(releases=[release])
+
+        invalid_channels = [
+            [1],
+            {'schema_version': '3.0.0'},
+            {'schema_version': '3.0.0', 'repositories': [1]},
+            {'schema_version': '3.0.0', 'repositories': [], 'packages_cache': []},
+            {'schema_version': '3.0.0', 'repositories': [], 'packages_cache': {'https://example.com': {}}},
+            {'schema_version': '3.0.0', 'repositories': [], 'dependencies_cache': {'https://example.com': [{}]}},
+            {'schema_version': '1.2', 'repositories': [], 'renamed_packages': []},
+            {'schema_version': '1.2', 'repositories': [], 'packages': {'https://example.com': [{'name': 'A'}]}},
+            package_channel(previous_names=1),
+            package_channel(releases=None),
+            package_channel(releases=['1.0.0']),
+            release_channel(platforms=None),
+            release_channel(version=1),
+            release_channel(sublime_text=3000),
+        ]
+
+        path = self.channel_path()
+        for channel_info in invalid_channels:
+            self.write_channel(path, channel_info)
+            provider = ChannelProvider(path, {'debug': False})
+            self.assertRaises(ProviderException, provider.fetch)